@@ -18,8 +18,61 @@ Usage in .hie files:
 """
 
 import json
+import os
+import select
 import sys
 
+# orjson is optional: it is much faster for these small payloads, but the
+# plugin falls back to the stdlib encoder when it is not installed. orjson
+# only handles 64-bit integers (it parses larger ones as floats and refuses
+# to serialize them), so lines and responses that need arbitrary-precision
+# integers, such as a very large request id, go through the stdlib instead
+# and ids are always echoed back exactly.
+try:
+    import orjson
+
+    def _loads(data):
+        message = orjson.loads(data)
+        if _has_float_id(message):
+            # The id may have been an integer literal beyond 64 bits
+            return json.loads(data)
+        return message
+
+    def _dumps(obj):
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # Integer exceeds 64-bit range
+            return json.dumps(obj).encode("utf-8")
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+
+def _has_float_id(message):
+    """Return True if a request, or any request in a batch, has a float id."""
+    if isinstance(message, dict):
+        return type(message.get("id")) is float
+    if isinstance(message, list):
+        return any(isinstance(request, dict) and type(request.get("id")) is float for request in message)
+    return False
+
+
+# Bytes requested per read from stdin, and the size at which buffered
+# responses are flushed even if more requests are waiting
+READ_SIZE = 64 * 1024
+FLUSH_THRESHOLD = 32 * 1024
+
+# Library metadata never changes while the plugin runs, so build it once
+LIBRARY_METADATA = {
+    "name": "sample",
+    "version": "1.0.0",
+    "functions": ["simple_selector"],
+    "checks": ["file_count_check", "always_pass", "always_fail"]
+}
+
 
 def handle_request(request):
     """Handle a JSON-RPC request and return a response."""
@@ -29,12 +82,7 @@ def handle_request(request):
     
     try:
         if method == "library.metadata":
-            result = {
-                "name": "sample",
-                "version": "1.0.0",
-                "functions": ["simple_selector"],
-                "checks": ["file_count_check", "always_pass", "always_fail"]
-            }
+            result = LIBRARY_METADATA
         elif method == "library.call":
             result = handle_call(params)
         elif method == "library.check":
@@ -47,6 +95,19 @@ def handle_request(request):
         return error_response(request_id, -32000, str(e))
 
 
+def handle_message(message):
+    """Handle a single JSON-RPC request or a JSON-RPC 2.0 batch array."""
+    if isinstance(message, dict):
+        return handle_request(message)
+    if isinstance(message, list) and message:
+        return [
+            handle_request(request) if isinstance(request, dict)
+            else error_response(None, -32600, "Invalid Request")
+            for request in message
+        ]
+    return error_response(None, -32600, "Invalid Request")
+
+
 def handle_call(params):
     """Handle a library function call (selector)."""
     function = params.get("function", "")
@@ -56,15 +117,35 @@ def handle_call(params):
     if function == "simple_selector":
         # Simple selector that returns a scope with the given path
         path = extract_string(args[0]) if args else ""
-        import os
         
         full_path = os.path.join(workspace, path)
         if os.path.isdir(full_path):
             # Return all files in the directory
+            # Iterative scandir walk with the same results and order as
+            # os.walk(full_path): DirEntry caches the file type, so no extra
+            # stat calls are needed, and entry.path is already joined with its
+            # parent. Symlinks to directories are listed nowhere and not
+            # followed; every other non-directory entry (including broken
+            # symlinks) is a file, and unreadable directories are skipped.
             files = []
-            for root, _, filenames in os.walk(full_path):
-                for filename in filenames:
-                    files.append(os.path.join(root, filename))
+            stack = [full_path]
+            add_file = files.append
+            while stack:
+                try:
+                    entries = os.scandir(stack.pop())
+                except OSError:
+                    continue
+                subdirs = []
+                with entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        else:
+                            add_file(entry.path)
+                # Push in reverse so subdirectories are visited top-down in
+                # listing order, like os.walk
+                stack.extend(reversed(subdirs))
             return {
                 "Scope": {
                     "kind": {"Folder": path},
@@ -125,29 +206,30 @@ def handle_check(params):
 
 def extract_string(value):
     """Extract a string from a Value JSON representation."""
-    if isinstance(value, str):
+    if type(value) is str:
         return value
-    if isinstance(value, dict):
-        if "String" in value:
-            return value["String"]
+    if type(value) is dict:
+        s = value.get("String")
+        if s is not None:
+            return s
     return str(value)
 
 
 def extract_int(value):
     """Extract an integer from a Value JSON representation."""
-    if isinstance(value, int):
+    if type(value) is int:
         return value
-    if isinstance(value, dict):
-        if "Int" in value:
-            return value["Int"]
+    if type(value) is dict:
+        i = value.get("Int")
+        if i is not None:
+            return i
     return int(value)
 
 
 def extract_scope(value):
     """Extract a Scope from a Value JSON representation."""
-    if isinstance(value, dict):
-        if "Scope" in value:
-            return value["Scope"]
+    if type(value) is dict:
+        return value.get("Scope")
     return None
 
 
@@ -172,21 +254,76 @@ def error_response(request_id, code, message):
     }
 
 
+def encode_response(response):
+    """Serialize a JSON-RPC response as one newline-terminated line."""
+    return _dumps(response) + b"\n"
+
+
+def handle_line(line):
+    """Handle one raw request line and return the encoded response, if any."""
+    line = line.strip()
+    if not line:
+        return None
+    
+    try:
+        message = _loads(line)
+        response = handle_message(message)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError; the stdlib
+        # decoder raises UnicodeDecodeError on invalid UTF-8 input bytes.
+        # Per JSON-RPC 2.0 spec, use null for id when it cannot be determined
+        response = error_response(None, -32700, f"Parse error: {e}")
+    return encode_response(response)
+
+
+def input_pending(fd):
+    """Return True if more input can be read from fd without blocking."""
+    try:
+        readable, _, _ = select.select([fd], [], [], 0)
+    except (OSError, ValueError):
+        # select() does not support pipes on Windows; flush every response
+        return False
+    return bool(readable)
+
+
 def main():
-    """Main loop: read JSON-RPC requests from stdin, write responses to stdout."""
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
-        
-        try:
-            request = json.loads(line)
-            response = handle_request(request)
-            print(json.dumps(response), flush=True)
-        except json.JSONDecodeError as e:
-            # Per JSON-RPC 2.0 spec, use null for id when it cannot be determined
-            error = error_response(None, -32700, f"Parse error: {e}")
-            print(json.dumps(error), flush=True)
+    """Main loop: read JSON-RPC requests from stdin, write responses to stdout.
+    
+    Requests that arrive in a burst are answered in one write: responses are
+    buffered and flushed once no more input is immediately available, or
+    when the buffer grows past FLUSH_THRESHOLD bytes.
+    """
+    fd = sys.stdin.fileno()
+    out = sys.stdout.buffer
+    pending = bytearray()
+    partial = b""
+    
+    def flush():
+        out.write(pending)
+        out.flush()
+        pending.clear()
+    
+    while True:
+        chunk = os.read(fd, READ_SIZE)
+        if not chunk:
+            break
+        # Raw bytes: both orjson and json accept them, so no text decode step
+        *lines, partial = (partial + chunk).split(b"\n")
+        for line in lines:
+            encoded = handle_line(line)
+            if encoded is not None:
+                pending += encoded
+                if len(pending) >= FLUSH_THRESHOLD:
+                    flush()
+        if pending and not input_pending(fd):
+            flush()
+    
+    # A final request may arrive without a trailing newline
+    encoded = handle_line(partial)
+    if encoded is not None:
+        pending += encoded
+    if pending:
+        flush()
 
 
 if __name__ == "__main__":
@@ -6,10 +6,54 @@ This script scans the patterns/ directory, extracts pattern definitions
 from .hie files, and generates a comprehensive markdown catalog.
 """
 
+import io
+import json
+import operator
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, TextIO
+
+
+# Header comment regexes, compiled once at module load
+_DESCRIPTION_RE = re.compile(r'##\s+Description:\s*\n##\s+(.*?)(?:\n##\s+Use Cases:|$)', re.DOTALL)
+_USE_CASES_RE = re.compile(r'##\s+Use Cases:\s*\n((?:##\s+.*\n)*)')
+_NL_HASH_RE = re.compile(r'\n##\s*')
+_BULLET_RE = re.compile(r'##\s+-\s+')
+
+# Below this many pattern files, parse serially in-process
+_PARALLEL_MIN_FILES = 32
+
+# Parsed-header cache, stored as JSON at the repository root. Bump the
+# version whenever the cached record layout changes *or* the parsing in
+# extract_patterns_from_file changes (regexes, header slicing): cache hits
+# are keyed on file mtime and size only, so stale parses would otherwise
+# survive a parser change.
+_CACHE_FILE_NAME = '.pattern_cache.json'
+_CACHE_VERSION = 2
+
+# Category directory names and their display names
+_CATEGORY_NAMES = {
+    'structural': 'Structural Patterns',
+    'behavioral': 'Behavioral Patterns',
+    'creational': 'Creational Patterns',
+    'infrastructure': 'Infrastructure Patterns',
+    'cross-cutting': 'Cross-Cutting Patterns',
+    'testing': 'Testing Patterns',
+    'compiler': 'Compiler/Interpreter Patterns'
+}
+
+# Sort key for os.DirEntry objects: plain str comparison on the entry name
+_BY_NAME = operator.attrgetter('name')
+
+# GitHub-style heading anchors: spaces become dashes, '/' and parentheses are dropped
+_SLUG_TRANS = str.maketrans({' ': '-', '/': '', '(': '', ')': ''})
+
+
+def _slug(text: str) -> str:
+    """Convert a heading into its markdown anchor."""
+    return text.lower().translate(_SLUG_TRANS)
 
 
 class Pattern:
@@ -22,6 +66,7 @@ class Pattern:
         self.description = ""
         self.use_cases = ""
         self.content = ""
+        self.anchor = _slug(name)
     
     def __repr__(self):
         return f"Pattern({self.name}, {self.category})"
@@ -34,20 +79,23 @@ def extract_patterns_from_file(file_path: Path, category: str) -> List[Pattern]:
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Extract description and use cases from header comments
-    description_match = re.search(r'##\s+Description:\s*\n##\s+(.*?)(?:\n##\s+Use Cases:|$)', content, re.DOTALL)
-    use_cases_match = re.search(r'##\s+Use Cases:\s*\n((?:##\s+.*\n)*)', content)
+    # Extract description and use cases from the header comment block, which
+    # ends at the first blank line (kept so the last header line ends in '\n')
+    head, blank, _ = content.partition('\n\n')
+    header = head + blank
+    description_match = _DESCRIPTION_RE.search(header)
+    use_cases_match = _USE_CASES_RE.search(header)
     
     description = ""
     use_cases = ""
     
     if description_match:
         description = description_match.group(1).strip()
-        description = re.sub(r'\n##\s*', ' ', description)
+        description = _NL_HASH_RE.sub(' ', description)
     
     if use_cases_match:
         use_cases_text = use_cases_match.group(1)
-        use_cases = re.sub(r'##\s+-\s+', '\n- ', use_cases_text).strip()
+        use_cases = _BULLET_RE.sub('\n- ', use_cases_text).strip()
     
     # Extract pattern name from filename
     pattern_name = file_path.stem.replace('_', ' ').title()
@@ -62,139 +110,225 @@ def extract_patterns_from_file(file_path: Path, category: str) -> List[Pattern]:
     return patterns
 
 
-def scan_patterns_directory(patterns_dir: Path) -> Dict[str, List[Pattern]]:
-    """Scan the patterns directory and extract all patterns organized by category."""
+def _pattern_record(pattern: Pattern) -> list:
+    """Reduce a pattern to the parsed fields stored in the cache."""
+    return [pattern.name, pattern.description, pattern.use_cases, pattern.content]
+
+
+def _pattern_from_record(record: list, category: str, file_path: str) -> Pattern:
+    """Rebuild a pattern from a cached record."""
+    name, description, use_cases, content = record
+    pattern = Pattern(name, category, file_path)
+    pattern.description = description
+    pattern.use_cases = use_cases
+    pattern.content = content
+    return pattern
+
+
+def _is_cache_entry(entry) -> bool:
+    """Check that a loaded cache entry is [mtime_ns, size, [[name, description, use_cases, content], ...]]."""
+    if not (isinstance(entry, list) and len(entry) == 3):
+        return False
+    mtime_ns, size, records = entry
+    if type(mtime_ns) is not int or type(size) is not int or not isinstance(records, list):
+        return False
+    return all(
+        isinstance(record, list) and len(record) == 4 and all(isinstance(field, str) for field in record)
+        for record in records
+    )
+
+
+def load_pattern_cache(cache_file: Path) -> Dict[str, list]:
+    """Load the parsed-header cache, or return an empty one if it is missing or unreadable.
+    
+    Malformed entries are dropped, so those files are simply parsed again.
+    """
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        version = data['version']
+        entries = data['entries']
+    except (OSError, ValueError, TypeError, KeyError):
+        return {}
+    if version != _CACHE_VERSION or not isinstance(entries, dict):
+        return {}
+    return {path: entry for path, entry in entries.items() if _is_cache_entry(entry)}
+
+
+def save_pattern_cache(cache_file: Path, cache: Dict[str, list]) -> None:
+    """Write the parsed-header cache; failures only cost a full reparse next run."""
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': _CACHE_VERSION, 'entries': cache}, f)
+    except OSError as e:
+        print(f"Warning: could not write pattern cache {cache_file}: {e}")
+
+
+def scan_patterns_directory(patterns_dir: Path, cache: Optional[Dict[str, list]] = None) -> Dict[str, List[Pattern]]:
+    """Scan the patterns directory and extract all patterns organized by category.
+    
+    If a cache is given, files whose mtime and size match their cache entry are
+    not read again, and the cache is updated in place to match the scanned files.
+    """
     categories = {}
+    if cache is None:
+        cache = {}
     
-    # Define category order and display names
-    category_names = {
-        'structural': 'Structural Patterns',
-        'behavioral': 'Behavioral Patterns',
-        'creational': 'Creational Patterns',
-        'infrastructure': 'Infrastructure Patterns',
-        'cross-cutting': 'Cross-Cutting Patterns',
-        'testing': 'Testing Patterns',
-        'compiler': 'Compiler/Interpreter Patterns'
-    }
-    
-    for category_dir in sorted(patterns_dir.iterdir()):
-        if category_dir.is_dir() and category_dir.name in category_names:
-            category = category_dir.name
-            display_name = category_names[category]
-            patterns = []
-            
-            for hie_file in sorted(category_dir.glob('*.hie')):
-                patterns.extend(extract_patterns_from_file(hie_file, category))
-            
-            if patterns:
-                categories[display_name] = patterns
+    # Collect every pattern file first so parsing can fan out across cores
+    hie_files = []
+    job_categories = []
+    stamps = []
+    with os.scandir(patterns_dir) as it:
+        category_entries = sorted(it, key=_BY_NAME)
+    for category_entry in category_entries:
+        if category_entry.is_dir() and category_entry.name in _CATEGORY_NAMES:
+            category = category_entry.name
+            with os.scandir(category_entry.path) as it:
+                hie_entries = sorted(
+                    (e for e in it if e.name.endswith('.hie') and e.is_file()),
+                    key=_BY_NAME,
+                )
+            for hie_entry in hie_entries:
+                st = hie_entry.stat()
+                hie_files.append(Path(hie_entry.path))
+                job_categories.append(category)
+                stamps.append([st.st_mtime_ns, st.st_size])
+    
+    # Reuse cached results for unchanged files; only the rest gets parsed
+    results = [None] * len(hie_files)
+    stale = []
+    for index, (hie_file, category, stamp) in enumerate(zip(hie_files, job_categories, stamps)):
+        file_path = str(hie_file)
+        entry = cache.get(file_path)
+        if entry is not None and entry[:2] == stamp:
+            results[index] = [_pattern_from_record(record, category, file_path) for record in entry[2]]
+        else:
+            stale.append(index)
+    
+    stale_files = [hie_files[index] for index in stale]
+    stale_categories = [job_categories[index] for index in stale]
+    if len(stale) < _PARALLEL_MIN_FILES:
+        # Process startup outweighs the parsing work for small libraries
+        parsed = map(extract_patterns_from_file, stale_files, stale_categories)
+    else:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            parsed = list(executor.map(extract_patterns_from_file, stale_files, stale_categories, chunksize=8))
+    for index, patterns in zip(stale, parsed):
+        results[index] = patterns
+    
+    # Drop entries for files that no longer exist and record fresh parses
+    cache.clear()
+    for hie_file, stamp, patterns in zip(hie_files, stamps, results):
+        cache[str(hie_file)] = stamp + [[_pattern_record(pattern) for pattern in patterns]]
+    
+    # Regroup by category; results follow scan order
+    for category, patterns in zip(job_categories, results):
+        if patterns:
+            categories.setdefault(_CATEGORY_NAMES[category], []).extend(patterns)
     
     return categories
 
 
-def generate_markdown_catalog(categories: Dict[str, List[Pattern]]) -> str:
-    """Generate markdown documentation from extracted patterns."""
+def generate_markdown_catalog(categories: Dict[str, List[Pattern]], out: TextIO) -> None:
+    """Generate markdown documentation from extracted patterns, writing it to out."""
+    
+    write = out.write
     
-    lines = [
-        "# Hielements Pattern Catalog",
-        "",
+    write(
+        "# Hielements Pattern Catalog\n"
+        "\n"
         "This catalog documents common software engineering patterns and their implementation in Hielements. "
-        "It serves both as a reference for users and as a test suite for the language's prescriptive capabilities.",
-        "",
+        "It serves both as a reference for users and as a test suite for the language's prescriptive capabilities.\n"
+        "\n"
         "> **Note**: This documentation is automatically generated from the pattern library in the `patterns/` directory. "
-        "Every pattern uses the prescriptive features of Hielements (patterns, `requires`, `forbids`, `allows`, `check`, `ref`, `uses`).",
-        "",
-        "---",
-        "",
-        "## Table of Contents",
-        ""
-    ]
-    
-    # Generate table of contents
-    for category_name, patterns in categories.items():
-        category_anchor = category_name.lower().replace(' ', '-').replace('/', '')
-        lines.append(f"- [{category_name}](#{category_anchor})")
-        for pattern in patterns:
-            pattern_anchor = pattern.name.lower().replace(' ', '-').replace('(', '').replace(')', '').replace('/', '')
-            lines.append(f"  - [{pattern.name}](#{pattern_anchor})")
-    
-    lines.extend(["", "---", ""])
+        "Every pattern uses the prescriptive features of Hielements (patterns, `requires`, `forbids`, `allows`, `check`, `ref`, `uses`).\n"
+        "\n"
+        "---\n"
+        "\n"
+        "## Table of Contents\n"
+        "\n"
+    )
     
-    # Generate pattern sections
+    # Generate table of contents and pattern sections in one pass; the TOC
+    # comes first in the output, so sections are staged in a buffer
+    toc = []
+    body = io.StringIO()
+    add_toc = toc.append
+    write_body = body.write
     for category_name, patterns in categories.items():
-        lines.append(f"## {category_name}")
-        lines.append("")
+        add_toc(f"- [{category_name}](#{_slug(category_name)})\n")
+        write_body(f"## {category_name}\n\n")
         
         for pattern in patterns:
-            pattern_anchor = pattern.name.lower().replace(' ', '-')
-            lines.append(f"### {pattern.name}")
-            lines.append("")
+            add_toc(f"  - [{pattern.name}](#{pattern.anchor})\n")
+            write_body(f"### {pattern.name}\n\n")
             
             if pattern.description:
-                lines.append(f"**Description**: {pattern.description}")
-                lines.append("")
+                write_body(f"**Description**: {pattern.description}\n\n")
             
             if pattern.use_cases:
-                lines.append(f"**Use Cases**:")
-                lines.append(pattern.use_cases)
-                lines.append("")
+                write_body(f"**Use Cases**:\n{pattern.use_cases}\n\n")
             
-            lines.append("**Hielements Implementation**:")
-            lines.append("")
-            lines.append("```hielements")
-            lines.append(pattern.content)
-            lines.append("```")
-            lines.append("")
-            lines.append("---")
-            lines.append("")
+            write_body(
+                "**Hielements Implementation**:\n"
+                "\n"
+                "```hielements\n"
+                f"{pattern.content}\n"
+                "```\n"
+                "\n"
+                "---\n"
+                "\n"
+            )
+    
+    write(''.join(toc))
+    write("\n---\n\n")
+    write(body.getvalue())
     
     # Add usage guidelines section
-    lines.extend([
-        "## Pattern Usage Guidelines",
-        "",
-        "### When to Use Patterns",
-        "",
-        "- **DO** use patterns when you have multiple components with similar structure",
-        "- **DO** use patterns to enforce architectural decisions across teams",
-        "- **DO** use patterns as documentation for expected component structure",
-        "- **DON'T** use patterns for truly unique one-off components",
-        "- **DON'T** over-engineer with patterns when a simple element suffices",
-        "",
-        "### Pattern Composition",
-        "",
-        "Patterns can be composed through multiple `implements`:",
-        "",
-        "```hielements",
-        "## Service implementing multiple patterns",
-        "element production_service implements microservice, observability, resilience {",
-        "    ## Microservice bindings",
-        "    scope api<rust> binds microservice.api.module = rust.module_selector('service::api')",
-        "    ",
-        "    ## Observability bindings  ",
-        "    scope metrics<rust> binds observability.metrics.module = rust.module_selector('service::metrics')",
-        "    ",
-        "    ## Resilience bindings",
-        "    scope circuit_breaker<rust> binds resilience.circuit_breaker.module = rust.module_selector('service::resilience')",
-        "}",
-        "```",
-        "",
-        "### Contributing New Patterns",
-        "",
-        "When adding new patterns to this catalog:",
-        "",
-        "1. Create a `.hie` file in the appropriate category directory",
-        "2. Include a description comment block with the pattern's intent and use cases",
-        "3. Implement using Hielements prescriptive features (`pattern`, `requires`, `forbids`, `allows`, `check`, `ref`, `uses`)",
-        "4. Provide at least one concrete implementation example",
-        "5. Regenerate this catalog using: `python3 scripts/generate_pattern_catalog.py`",
-        "",
-        "---",
-        "",
+    write(
+        "## Pattern Usage Guidelines\n"
+        "\n"
+        "### When to Use Patterns\n"
+        "\n"
+        "- **DO** use patterns when you have multiple components with similar structure\n"
+        "- **DO** use patterns to enforce architectural decisions across teams\n"
+        "- **DO** use patterns as documentation for expected component structure\n"
+        "- **DON'T** use patterns for truly unique one-off components\n"
+        "- **DON'T** over-engineer with patterns when a simple element suffices\n"
+        "\n"
+        "### Pattern Composition\n"
+        "\n"
+        "Patterns can be composed through multiple `implements`:\n"
+        "\n"
+        "```hielements\n"
+        "## Service implementing multiple patterns\n"
+        "element production_service implements microservice, observability, resilience {\n"
+        "    ## Microservice bindings\n"
+        "    scope api<rust> binds microservice.api.module = rust.module_selector('service::api')\n"
+        "    \n"
+        "    ## Observability bindings  \n"
+        "    scope metrics<rust> binds observability.metrics.module = rust.module_selector('service::metrics')\n"
+        "    \n"
+        "    ## Resilience bindings\n"
+        "    scope circuit_breaker<rust> binds resilience.circuit_breaker.module = rust.module_selector('service::resilience')\n"
+        "}\n"
+        "```\n"
+        "\n"
+        "### Contributing New Patterns\n"
+        "\n"
+        "When adding new patterns to this catalog:\n"
+        "\n"
+        "1. Create a `.hie` file in the appropriate category directory\n"
+        "2. Include a description comment block with the pattern's intent and use cases\n"
+        "3. Implement using Hielements prescriptive features (`pattern`, `requires`, `forbids`, `allows`, `check`, `ref`, `uses`)\n"
+        "4. Provide at least one concrete implementation example\n"
+        "5. Regenerate this catalog using: `python3 scripts/generate_pattern_catalog.py`\n"
+        "\n"
+        "---\n"
+        "\n"
         "**Note**: This catalog is automatically generated from the Hielements pattern library. "
-        "To add or modify patterns, edit the `.hie` files in the `patterns/` directory and regenerate this documentation.",
-    ])
-    
-    return '\n'.join(lines)
+        "To add or modify patterns, edit the `.hie` files in the `patterns/` directory and regenerate this documentation."
+    )
 
 
 def main():
@@ -204,24 +338,33 @@ def main():
     repo_root = script_dir.parent
     patterns_dir = repo_root / 'patterns'
     output_file = repo_root / 'doc' / 'patterns_catalog.md'
+    cache_file = repo_root / _CACHE_FILE_NAME
     
     if not patterns_dir.exists():
         print(f"Error: Patterns directory not found at {patterns_dir}")
         return 1
     
     print(f"Scanning patterns directory: {patterns_dir}")
-    categories = scan_patterns_directory(patterns_dir)
+    cache = load_pattern_cache(cache_file)
+    categories = scan_patterns_directory(patterns_dir, cache)
     
     total_patterns = sum(len(patterns) for patterns in categories.values())
     print(f"Found {total_patterns} patterns in {len(categories)} categories")
     
     print("Generating markdown catalog...")
-    markdown = generate_markdown_catalog(categories)
-    
-    # Write output
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(markdown)
+    # Stream into a sibling temp file and swap it in, so a failure during
+    # generation never leaves a truncated catalog behind
+    tmp_file = output_file.with_name(output_file.name + '.tmp')
+    try:
+        with open(tmp_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            generate_markdown_catalog(categories, f)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    
+    save_pattern_cache(cache_file, cache)
     
     print(f"✓ Pattern catalog generated: {output_file}")
     print(f"  {total_patterns} patterns documented")